@@ -15,10 +15,16 @@ load_dotenv(dotenv_path=env_path)
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 if __name__ == "__main__":
+    # Auto-reload is for development only; it pins the server to one process
+    reload = os.getenv("ENV") == "dev"
+
     uvicorn.run(
         "wolfram_language_server.main:app",
         host=os.getenv("HOST", "0.0.0.0"),
         port=int(os.getenv("PORT", 8000)),
-        reload=True,
+        reload=reload,
+        workers=None if reload else int(os.getenv("WORKERS", 1)),
+        loop="auto",  # uvloop where installed (not on Windows), else asyncio
+        http="httptools",
         log_level=os.getenv("LOG_LEVEL", "info").lower()
-    )
\ No newline at end of file
+    )
@@ -1,15 +1,20 @@
 """Main FastAPI application for Wolfram Language Server."""
 
+import asyncio
 import logging
 import os
+import time
 from contextlib import asynccontextmanager
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Iterator, Optional
 from pathlib import Path
 
+import orjson
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, status
+from fastapi import Depends, FastAPI, Header, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.routing import APIRoute
+from wolframclient.serializers import export
 
 # Load environment variables from .env file
 env_path = Path(__file__).parent.parent.parent / ".env"
@@ -17,7 +22,7 @@ load_dotenv(dotenv_path=env_path)
 
 from .models import (
     WolframRequest, WolframResponse, HealthResponse, ErrorResponse,
-    ExecuteWolframRequest
+    ExecuteWolframRequest, ExecuteBatchRequest, ExecuteBatchResponse
 )
 from .wolfram_client import ImprovedWolframLanguageClient
 from . import __version__
@@ -31,60 +36,127 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Global Wolfram executor
-wolfram_executor: ImprovedWolframLanguageClient = None
+# Payload bytes per frame on the streaming endpoint
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Seconds before /health refreshes its cached kernel info
+HEALTH_REFRESH_INTERVAL = 30.0
+
+
+async def _refresh_health(app: FastAPI) -> None:
+    """Fetch kernel info and cache it for /health."""
+    try:
+        app.state.last_kernel_info = await app.state.executor.get_kernel_info()
+    except Exception as e:
+        logger.error(f"Health check error: {e}")
+    app.state.last_health_check_ts = time.monotonic()
+
+
+def _schedule_health_refresh(app: FastAPI) -> None:
+    """Start a background health refresh unless one is already running."""
+    task = app.state.health_refresh_task
+    if task is None or task.done():
+        app.state.health_refresh_task = asyncio.create_task(_refresh_health(app))
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan."""
-    global wolfram_executor
-
     # Startup
     logger.info("Starting Wolfram Language Server")
     kernel_path = os.getenv("WOLFRAM_KERNEL_PATH")
-    wolfram_executor = ImprovedWolframLanguageClient(kernel_path=kernel_path)
+    # One kernel by default so definitions carry over between requests
+    pool_size = int(os.getenv("WOLFRAM_POOL_SIZE", "1"))
+    wolfram_executor = ImprovedWolframLanguageClient(kernel_path=kernel_path, pool_size=pool_size)
+    app.state.executor = wolfram_executor
+    app.state.last_kernel_info = None
+    app.state.last_health_check_ts = float("-inf")
+    app.state.health_refresh_task = None
 
     try:
-        # Test Wolfram availability
-        available, error = await wolfram_executor.is_available()
-        if available:
-            logger.info("Wolfram Language is available")
+        # Start the session pool so requests never wait on a cold kernel
+        live = await wolfram_executor.prewarm()
+        if live:
+            logger.info(f"Wolfram Language is available ({live}/{pool_size} pooled sessions)")
         else:
-            logger.warning(f"Wolfram Language not available: {error}")
+            logger.warning("Wolfram Language not available: Failed to create Wolfram session")
     except Exception as e:
         logger.error(f"Failed to initialize Wolfram executor: {e}")
 
+    _schedule_health_refresh(app)
+
     yield
 
     # Shutdown
     logger.info("Shutting down Wolfram Language Server")
-    if wolfram_executor:
-        await wolfram_executor.stop_session()
+    if app.state.health_refresh_task is not None:
+        app.state.health_refresh_task.cancel()
+    await wolfram_executor.stop_session()
+
+
+class ORJSONRequest(Request):
+    """Request that decodes its JSON body with orjson, once."""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    """Route class that parses request bodies through ORJSONRequest."""
+
+    def get_route_handler(self) -> Callable:
+        original_route_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            return await original_route_handler(ORJSONRequest(request.scope, request.receive))
+
+        return route_handler
 
 
 app = FastAPI(
     title="Wolfram Language Server",
     description="Backend API for executing Wolfram Language scripts",
     version=__version__,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
+app.router.route_class = ORJSONRoute
+
+# Add CORS middleware only when browser origins are configured
+cors_origins = [origin.strip() for origin in os.getenv("CORS_ORIGINS", "").split(",") if origin.strip()]
+if cors_origins:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=cors_origins,
+        allow_credentials=os.getenv("CORS_ALLOW_CREDENTIALS", "false").lower() == "true",
+        allow_methods=["GET", "POST"],
+        allow_headers=["content-type", "authorization"],
+    )
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+
+async def get_executor(request: Request) -> ImprovedWolframLanguageClient:
+    """Dependency returning the Wolfram executor created in lifespan()."""
+    return request.app.state.executor
+
+
+async def _format_output(result: Any) -> Optional[str]:
+    """Render a Wolfram result as text on a worker thread.
+
+    str() walks the whole expression, which can take a while for large
+    symbolic results and would otherwise block the event loop.
+    """
+    if result is None:
+        return None
+    return await asyncio.to_thread(str, result)
 
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler."""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content=ErrorResponse(
             error="InternalServerError",
@@ -94,59 +166,65 @@ async def global_exception_handler(request, exc):
 
 
 @app.get("/health", response_model=HealthResponse)
-async def health_check():
-    """Health check endpoint."""
-    global wolfram_executor
+async def health_check(
+    request: Request,
+    wolfram_executor: ImprovedWolframLanguageClient = Depends(get_executor)
+):
+    """Health check endpoint.
 
-    wolfram_available = False
-    kernel_info = None
+    Never waits on the kernel: availability comes from the session pool's
+    health flag and kernel info from a cache refreshed in the background.
+    """
+    state = request.app.state
+    if time.monotonic() - state.last_health_check_ts >= HEALTH_REFRESH_INTERVAL:
+        _schedule_health_refresh(request.app)
 
-    if wolfram_executor:
-        try:
-            wolfram_available, _ = await wolfram_executor.is_available()
-            if wolfram_available:
-                kernel_info = await wolfram_executor.get_kernel_info()
-        except Exception as e:
-            logger.error(f"Health check error: {e}")
+    wolfram_available = wolfram_executor.healthy
 
     return HealthResponse(
         status="healthy",
         version=__version__,
         wolfram_available=wolfram_available,
-        kernel_info=kernel_info
+        kernel_info=state.last_kernel_info if wolfram_available else None
     )
 
 
 @app.post("/execute-wolfram", response_model=WolframResponse)
-async def execute_wolfram_code(request: ExecuteWolframRequest):
-    """Execute Wolfram Language code using wlexpr (strict syntax)."""
-    global wolfram_executor
-
-    if not wolfram_executor:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Wolfram executor not initialized"
-        )
-
+async def execute_wolfram_code(
+    request: ExecuteWolframRequest,
+    wolfram_executor: ImprovedWolframLanguageClient = Depends(get_executor),
+    accept: Optional[str] = Header(None)
+):
+    """Execute Wolfram Language code using wlexpr (strict syntax).
+
+    Clients sending ``Accept: application/octet-stream`` receive a successful
+    result as raw ``application/x-wolfram`` InputForm bytes instead of JSON.
+    """
     # Check if Wolfram is available
-    available, error = await wolfram_executor.is_available()
-    if not available:
+    if not wolfram_executor.healthy:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"Wolfram Language not available: {error}"
+            detail="Wolfram Language not available: no working kernel session"
         )
 
     try:
         # Execute the Wolfram code using wlexpr
         success, result, error_msg, execution_time = await wolfram_executor.execute_wolfram_code(
             request.code,
-            request.timeout or 30
+            request.timeout or 30,
+            request.cacheable
         )
 
+        if success and accept and "application/octet-stream" in accept:
+            body = await asyncio.to_thread(export, result)
+            return Response(
+                content=body,
+                media_type="application/x-wolfram",
+                headers={"X-Execution-Time": f"{execution_time:.6f}"}
+            )
+
         # Format the result
-        output = None
-        if success and result is not None:
-            output = str(result)
+        output = await _format_output(result) if success else None
 
         return WolframResponse(
             success=success,
@@ -164,6 +242,94 @@ async def execute_wolfram_code(request: ExecuteWolframRequest):
         )
 
 
+def _framed_chunks(text: str) -> Iterator[bytes]:
+    """Yield UTF-8 encoded text as frames prefixed with a 4-byte big-endian length."""
+    data = memoryview(text.encode())
+    for offset in range(0, len(data), STREAM_CHUNK_SIZE):
+        chunk = data[offset:offset + STREAM_CHUNK_SIZE]
+        yield len(chunk).to_bytes(4, "big") + chunk
+
+
+@app.post("/execute-wolfram/stream")
+async def execute_wolfram_code_stream(
+    request: ExecuteWolframRequest,
+    wolfram_executor: ImprovedWolframLanguageClient = Depends(get_executor)
+):
+    """Execute Wolfram Language code and stream the output as length-prefixed frames.
+
+    Each frame is a 4-byte big-endian payload length followed by up to
+    16KB of UTF-8 output, so clients can consume large results incrementally.
+    """
+    # Check if Wolfram is available
+    if not wolfram_executor.healthy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Wolfram Language not available: no working kernel session"
+        )
+
+    success, result, error_msg, execution_time = await wolfram_executor.execute_wolfram_code(
+        request.code,
+        request.timeout or 30,
+        request.cacheable
+    )
+
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Execution failed: {error_msg}"
+        )
+
+    output = await _format_output(result)
+    return StreamingResponse(
+        _framed_chunks(output or ""),
+        media_type="application/octet-stream",
+        headers={"X-Execution-Time": f"{execution_time:.6f}"}
+    )
+
+
+@app.post("/execute-batch", response_model=ExecuteBatchResponse)
+async def execute_batch(
+    request: ExecuteBatchRequest,
+    wolfram_executor: ImprovedWolframLanguageClient = Depends(get_executor)
+):
+    """Execute several Wolfram Language snippets concurrently across the session pool."""
+    # Check if Wolfram is available
+    if not wolfram_executor.healthy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Wolfram Language not available: no working kernel session"
+        )
+
+    try:
+        results = await wolfram_executor.execute_batch(
+            request.codes,
+            request.timeout or 30,
+            request.cacheable
+        )
+
+        outputs = await asyncio.gather(*(
+            _format_output(result if success else None)
+            for success, result, _, _ in results
+        ))
+
+        return ExecuteBatchResponse(results=[
+            WolframResponse(
+                success=success,
+                result=None,
+                output=output,
+                error=error_msg,
+                execution_time=execution_time
+            )
+            for (success, _, error_msg, execution_time), output in zip(results, outputs)
+        ])
+
+    except Exception as e:
+        logger.error(f"Wolfram batch execution error: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Execution failed: {str(e)}"
+        )
+
 
 @app.get("/")
 async def root():
@@ -175,6 +341,8 @@ async def root():
         "endpoints": {
             "health": "/health",
             "execute-wolfram": "/execute-wolfram",
+            "execute-wolfram-stream": "/execute-wolfram/stream",
+            "execute-batch": "/execute-batch",
             "docs": "/docs",
             "openapi": "/openapi.json"
         }
@@ -184,10 +352,13 @@ async def root():
 if __name__ == "__main__":
     import uvicorn
 
+    reload = os.getenv("ENV") == "dev"
     uvicorn.run(
         "wolfram_language_server.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=reload,
+        workers=None if reload else int(os.getenv("WORKERS", 1)),
+        loop="auto",  # uvloop where installed (not on Windows), else asyncio
         log_level="info"
     )
@@ -2,159 +2,138 @@
 
 import logging
 import time
-from typing import Callable
+from typing import Optional
 
-from fastapi import Request, Response, HTTPException, status
+from fastapi import HTTPException, status
 from fastapi.responses import JSONResponse
 
 from .security import rate_limiter, auth_handler, code_validator
-from .models import ErrorResponse
+from .models import ErrorResponse, ExecuteWolframRequest, ExecuteBatchRequest
 
 
 logger = logging.getLogger(__name__)
 
 
-class SecurityMiddleware:
-    """Security middleware for rate limiting and authentication."""
-    
+class ObservabilityMiddleware:
+    """Rate limiting, authentication and request logging in a single ASGI pass.
+
+    Headers are read straight from the ASGI scope once per request instead
+    of building ``Request`` objects in separate middlewares.
+    """
+
+    # Endpoints exempt from rate limiting and authentication
+    PUBLIC_PATHS = frozenset({"/health", "/docs", "/openapi.json", "/redoc"})
+
+    # Endpoints that require authentication
+    PROTECTED_PATHS = frozenset({"/execute-wolfram", "/execute-wolfram/stream", "/execute-batch"})
+
     def __init__(self, app):
         self.app = app
-    
+
     async def __call__(self, scope, receive, send):
-        if scope["type"] == "http":
-            request = Request(scope, receive)
-            
-            # Get client IP
-            client_ip = self._get_client_ip(request)
-            
-            # Skip middleware for health and docs endpoints
-            if request.url.path in ["/health", "/docs", "/openapi.json", "/redoc"]:
-                await self.app(scope, receive, send)
-                return
-            
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.monotonic()
+        path = scope["path"]
+
+        # Single pass over the raw (lowercased) header list
+        forwarded_for = real_ip = authorization = None
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                forwarded_for = value
+            elif name == b"x-real-ip":
+                real_ip = value
+            elif name == b"authorization":
+                authorization = value
+
+        client_ip = self._get_client_ip(scope, forwarded_for, real_ip)
+        logger.info(f"Request: {scope['method']} {path} from {client_ip}")
+
+        # Create a custom send function to capture response
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                duration = time.monotonic() - start_time
+                logger.info(f"Response: {message['status']} in {duration:.3f}s")
+            await send(message)
+
+        if path not in self.PUBLIC_PATHS:
             # Rate limiting
             allowed, reason = rate_limiter.is_allowed(client_ip)
             if not allowed:
                 logger.warning(f"Rate limit exceeded for {client_ip}: {reason}")
-                response = JSONResponse(
-                    status_code=429,
-                    content=ErrorResponse(
-                        error="RateLimitExceeded",
-                        message=reason
-                    ).model_dump()
-                )
-                await response(scope, receive, send)
+                response = self._error_response(429, "RateLimitExceeded", reason)
+                await response(scope, receive, send_wrapper)
                 return
-            
+
             # Authentication (for protected endpoints)
-            if request.url.path in ["/execute-wolfram"]:
-                authenticated, auth_reason = await auth_handler.authenticate(request)
+            if path in self.PROTECTED_PATHS:
+                authenticated, auth_reason = auth_handler.check_authorization(
+                    authorization.decode("latin-1") if authorization else None
+                )
                 if not authenticated:
                     logger.warning(f"Authentication failed for {client_ip}: {auth_reason}")
-                    response = JSONResponse(
-                        status_code=401,
-                        content=ErrorResponse(
-                            error="Unauthorized",
-                            message=auth_reason
-                        ).model_dump()
-                    )
-                    await response(scope, receive, send)
+                    response = self._error_response(401, "Unauthorized", auth_reason)
+                    await response(scope, receive, send_wrapper)
                     return
-        
-        await self.app(scope, receive, send)
-    
-    def _get_client_ip(self, request: Request) -> str:
-        """Extract client IP from request."""
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _get_client_ip(scope, forwarded_for: Optional[bytes], real_ip: Optional[bytes]) -> str:
+        """Extract client IP from proxy headers or the connection."""
         # Check for forwarded headers (in case of proxy)
-        forwarded_for = request.headers.get("X-Forwarded-For")
         if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
-        
-        real_ip = request.headers.get("X-Real-IP")
+            return forwarded_for.split(b",", 1)[0].strip().decode("latin-1")
+
         if real_ip:
-            return real_ip
-        
+            return real_ip.decode("latin-1")
+
         # Fallback to direct connection
-        if hasattr(request.client, "host"):
-            return request.client.host
-        
+        client = scope.get("client")
+        if client:
+            return client[0]
+
         return "unknown"
 
+    @staticmethod
+    def _error_response(status_code: int, error: str, message: str) -> JSONResponse:
+        """Build an ErrorResponse-shaped JSON response."""
+        return JSONResponse(
+            status_code=status_code,
+            content=ErrorResponse(error=error, message=message).model_dump()
+        )
 
-class LoggingMiddleware:
-    """Middleware for request/response logging."""
-    
-    def __init__(self, app):
-        self.app = app
-    
-    async def __call__(self, scope, receive, send):
-        if scope["type"] == "http":
-            start_time = time.time()
-            request = Request(scope, receive)
-            
-            # Log request
-            client_ip = self._get_client_ip(request)
-            logger.info(f"Request: {request.method} {request.url.path} from {client_ip}")
-            
-            # Create a custom send function to capture response
-            async def send_wrapper(message):
-                if message["type"] == "http.response.start":
-                    duration = time.time() - start_time
-                    status_code = message["status"]
-                    logger.info(f"Response: {status_code} in {duration:.3f}s")
-                await send(message)
-            
-            await self.app(scope, receive, send_wrapper)
-        else:
-            await self.app(scope, receive, send)
-    
-    def _get_client_ip(self, request: Request) -> str:
-        """Extract client IP from request."""
-        forwarded_for = request.headers.get("X-Forwarded-For")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
-        
-        real_ip = request.headers.get("X-Real-IP")
-        if real_ip:
-            return real_ip
-        
-        if hasattr(request.client, "host"):
-            return request.client.host
-        
-        return "unknown"
+
+def _check_code(code: str) -> None:
+    """Reject code that fails security validation."""
+    is_safe, warnings = code_validator.validate_code(code)
+
+    if not is_safe:
+        logger.warning(f"Unsafe code detected: {warnings}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ErrorResponse(
+                error="UnsafeCode",
+                message="Code contains potentially dangerous operations",
+                details={"warnings": warnings}
+            ).model_dump()
+        )
+
+    # Log warnings but allow execution
+    if warnings:
+        logger.warning(f"Code warnings: {warnings}")
+
+
+async def validate_code_dep(request: ExecuteWolframRequest) -> ExecuteWolframRequest:
+    """Dependency that validates Wolfram code on the already-parsed request body."""
+    _check_code(request.code)
+    return request
 
 
-async def validate_code_middleware(request: Request, call_next: Callable) -> Response:
-    """Middleware to validate Wolfram code for security."""
-    if request.url.path in ["/execute-wolfram"] and request.method == "POST":
-        try:
-            # Read the request body
-            body = await request.body()
-            if body:
-                import json
-                data = json.loads(body)
-                code = data.get("code", "")
-                
-                # Validate the code
-                is_safe, warnings = code_validator.validate_code(code)
-                
-                if not is_safe:
-                    logger.warning(f"Unsafe code detected: {warnings}")
-                    return JSONResponse(
-                        status_code=400,
-                        content=ErrorResponse(
-                            error="UnsafeCode",
-                            message="Code contains potentially dangerous operations",
-                            details={"warnings": warnings}
-                        ).model_dump()
-                    )
-                
-                # Log warnings but allow execution
-                if warnings:
-                    logger.warning(f"Code warnings: {warnings}")
-        
-        except Exception as e:
-            logger.error(f"Error in code validation middleware: {e}")
-    
-    response = await call_next(request)
-    return response
\ No newline at end of file
+async def validate_batch_dep(request: ExecuteBatchRequest) -> ExecuteBatchRequest:
+    """Dependency that validates every snippet of a batch request."""
+    for code in request.codes:
+        _check_code(code)
+    return request
@@ -1,12 +1,14 @@
 """Pydantic models for the Wolfram Language Server API."""
 
 from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class WolframRequest(BaseModel):
     """Request model for Wolfram Language execution."""
     
+    model_config = ConfigDict(extra="forbid")
+
     code: str = Field(..., description="Wolfram Language code to execute")
     timeout: Optional[int] = Field(30, description="Execution timeout in seconds", ge=1, le=300)
     format: Optional[str] = Field("text", description="Output format: 'text', 'json', 'image'")
@@ -16,8 +18,10 @@ class WolframRequest(BaseModel):
 class WolframResponse(BaseModel):
     """Response model for Wolfram Language execution."""
     
+    model_config = ConfigDict(extra="forbid")
+
     success: bool = Field(..., description="Whether execution was successful")
-    result: Optional[Any] = Field(None, description="Execution result")
+    result: Optional[Union[str, int, float, bool, List, Dict]] = Field(None, description="Execution result")
     output: Optional[str] = Field(None, description="Text output from execution")
     error: Optional[str] = Field(None, description="Error message if execution failed")
     execution_time: Optional[float] = Field(None, description="Execution time in seconds")
@@ -27,6 +31,8 @@ class WolframResponse(BaseModel):
 class HealthResponse(BaseModel):
     """Health check response model."""
     
+    model_config = ConfigDict(extra="forbid")
+
     status: str = Field(..., description="Service status")
     version: str = Field(..., description="API version")
     wolfram_available: bool = Field(..., description="Whether Wolfram Engine is available")
@@ -36,6 +42,8 @@ class HealthResponse(BaseModel):
 class ErrorResponse(BaseModel):
     """Error response model."""
     
+    model_config = ConfigDict(extra="forbid")
+
     error: str = Field(..., description="Error type")
     message: str = Field(..., description="Error message")
     details: Optional[Dict[str, Any]] = Field(None, description="Additional error details")
@@ -44,13 +52,18 @@ class ErrorResponse(BaseModel):
 class EvaluateRequest(BaseModel):
     """Request model for simple expression evaluation."""
     
+    model_config = ConfigDict(extra="forbid")
+
     expression: str = Field(..., description="Wolfram Language expression to evaluate")
     timeout: Optional[int] = Field(10, description="Evaluation timeout in seconds", ge=1, le=60)
+    cacheable: bool = Field(True, description="Allow serving a cached result for identical deterministic code")
 
 
 class EvaluateResponse(BaseModel):
     """Response model for simple expression evaluation."""
     
+    model_config = ConfigDict(extra="forbid")
+
     success: bool = Field(..., description="Whether evaluation was successful")
     result: Optional[Union[str, int, float, bool, List, Dict]] = Field(None, description="Evaluation result")
     error: Optional[str] = Field(None, description="Error message if evaluation failed")
@@ -60,7 +73,26 @@ class EvaluateResponse(BaseModel):
 class ExecuteWolframRequest(BaseModel):
     """Request model for Wolfram Language execution using wlexpr."""
     
+    model_config = ConfigDict(extra="forbid")
+
     code: str = Field(..., description="Wolfram Language code to execute (strict syntax)")
     timeout: Optional[int] = Field(30, description="Execution timeout in seconds", ge=1, le=300)
+    cacheable: bool = Field(True, description="Allow serving a cached result for identical deterministic code")
 
 
+class ExecuteBatchRequest(BaseModel):
+    """Request model for executing several independent Wolfram Language snippets."""
+    
+    model_config = ConfigDict(extra="forbid")
+
+    codes: List[str] = Field(..., description="Wolfram Language snippets to execute (strict syntax)", min_length=1, max_length=50)
+    timeout: Optional[int] = Field(30, description="Execution timeout in seconds, applied to each snippet separately", ge=1, le=300)
+    cacheable: bool = Field(True, description="Allow serving cached results for identical deterministic code")
+
+
+class ExecuteBatchResponse(BaseModel):
+    """Response model for batch execution."""
+    
+    model_config = ConfigDict(extra="forbid")
+
+    results: List[WolframResponse] = Field(..., description="Results in the same order as the submitted snippets")
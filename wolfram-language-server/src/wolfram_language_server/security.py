@@ -1,15 +1,28 @@
 """Security utilities and middleware for the Wolfram Language Server."""
 
+import functools
+import hmac
 import logging
 import re
+import threading
 import time
-from typing import Dict, List, Set
-from collections import defaultdict, deque
+from collections import OrderedDict
+from typing import List, Optional, Set, Tuple
 
 from fastapi import Request, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.security.utils import get_authorization_scheme_param
 
+try:
+    import hyperscan
+except ImportError:  # Optional accelerator; fall back to the re scanner
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:  # Optional accelerator; fall back to substring checks
+    ahocorasick = None
+
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +53,15 @@ class CodeValidator:
         r'DeleteFile\[.*\]'
     ]
     
+    # Namespaces that indicate attempts to break out
+    RESTRICTED_NAMESPACES = ("System`", "Developer`", "Internal`")
+    
+    # Longest code accepted for scanning (prevent extremely long code)
+    MAX_CODE_LENGTH = 50000  # 50KB limit
+    
+    # Number of distinct code strings whose scan results are memoized
+    SCAN_CACHE_SIZE = 1024
+    
     def __init__(self, strict_mode: bool = True):
         """Initialize the code validator.
         
@@ -47,7 +69,54 @@ class CodeValidator:
             strict_mode: If True, apply strict security rules
         """
         self.strict_mode = strict_mode
-        self.compiled_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.RISKY_PATTERNS]
+        # Wolfram identifiers are case-sensitive, so patterns match case-sensitively
+        self.compiled_patterns = [re.compile(pattern) for pattern in self.RISKY_PATTERNS]
+        self._keyword_automaton = None
+        if ahocorasick is not None:
+            self._keyword_automaton = ahocorasick.Automaton()
+            for func in self.DANGEROUS_FUNCTIONS:
+                self._keyword_automaton.add_word(func, ("function", func))
+            for keyword in self.RESTRICTED_NAMESPACES:
+                self._keyword_automaton.add_word(keyword, ("namespace", keyword))
+            self._keyword_automaton.make_automaton()
+        self._hs_db = None
+        if hyperscan is not None:
+            try:
+                self._build_hyperscan_db()
+            except hyperscan.error as e:
+                logger.warning(f"Hyperscan unavailable, using regex validator: {e}")
+                self._hs_db = None
+        # Every check begins with a literal character; code containing none of them is clean
+        self._trigger_chars = frozenset(
+            check[0] for check in (*self.DANGEROUS_FUNCTIONS, *self.RISKY_PATTERNS, *self.RESTRICTED_NAMESPACES)
+        )
+        # Memoize scans per code string; oversized code is rejected before reaching it
+        self._scan_cached = functools.lru_cache(maxsize=self.SCAN_CACHE_SIZE)(self._scan)
+    
+    def _build_hyperscan_db(self) -> None:
+        """Compile every check into a single Hyperscan database."""
+        # (kind, label) per pattern id; the id is the index into this list
+        self._hs_labels = []
+        expressions = []
+        for func in sorted(self.DANGEROUS_FUNCTIONS):
+            self._hs_labels.append(("function", func))
+            expressions.append(re.escape(func).encode())
+        for pattern in self.RISKY_PATTERNS:
+            self._hs_labels.append(("pattern", pattern))
+            expressions.append(pattern.encode())
+        for keyword in self.RESTRICTED_NAMESPACES:
+            self._hs_labels.append(("namespace", keyword))
+            expressions.append(re.escape(keyword).encode())
+        
+        self._hs_db = hyperscan.Database()
+        self._hs_db.compile(
+            expressions=expressions,
+            ids=list(range(len(expressions))),
+            flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(expressions),
+        )
+        # Scratch space is not thread-safe, so scans are serialized on it
+        self._hs_scratch = hyperscan.Scratch(self._hs_db)
+        self._hs_lock = threading.Lock()
     
     def validate_code(self, code: str) -> tuple[bool, List[str]]:
         """Validate Wolfram Language code for security risks.
@@ -58,50 +127,107 @@ class CodeValidator:
         Returns:
             Tuple of (is_safe, list_of_warnings)
         """
-        warnings = []
+        # Reject oversized code up front instead of scanning all of it
+        if len(code) > self.MAX_CODE_LENGTH:
+            return not self.strict_mode, ["Code too long (>50KB)"]
         
-        # Check for dangerous functions
-        for func in self.DANGEROUS_FUNCTIONS:
-            if func in code:
+        if self._trigger_chars.isdisjoint(code):
+            return True, []
+        
+        warnings = []
+        for kind, label in self._scan_cached(code):
+            if kind == "function":
                 if self.strict_mode:
-                    warnings.append(f"Dangerous function detected: {func}")
+                    warnings.append(f"Dangerous function detected: {label}")
                 else:
-                    logger.warning(f"Potentially dangerous function used: {func}")
+                    logger.warning(f"Potentially dangerous function used: {label}")
+            elif kind == "pattern":
+                warnings.append(f"Risky pattern detected: {label}")
+            else:
+                warnings.append(f"Restricted namespace access: {label}")
         
-        # Check for risky patterns
-        for pattern in self.compiled_patterns:
-            if pattern.search(code):
-                warnings.append(f"Risky pattern detected: {pattern.pattern}")
+        is_safe = len(warnings) == 0 or not self.strict_mode
+        return is_safe, warnings
+    
+    def _scan(self, code: str) -> Tuple[Tuple[str, str], ...]:
+        """Find every check that matches the code.
         
-        # Check code length (prevent extremely long code)
-        if len(code) > 50000:  # 50KB limit
-            warnings.append("Code too long (>50KB)")
+        Returns:
+            ``(kind, label)`` pairs ordered functions, patterns, namespaces
+        """
+        if self._hs_db is not None:
+            return self._scan_hyperscan(code)
         
-        # Check for obvious attempts to break out
-        dangerous_keywords = ["System`", "Developer`", "Internal`"]
-        for keyword in dangerous_keywords:
-            if keyword in code:
-                warnings.append(f"Restricted namespace access: {keyword}")
+        if self._keyword_automaton is not None:
+            # One pass over the code for every function and namespace keyword
+            found = {match for _, match in self._keyword_automaton.iter(code)}
+            functions = sorted(label for kind, label in found if kind == "function")
+            namespaces = sorted(label for kind, label in found if kind == "namespace")
+        else:
+            functions = [func for func in self.DANGEROUS_FUNCTIONS if func in code]
+            namespaces = [keyword for keyword in self.RESTRICTED_NAMESPACES if keyword in code]
         
-        is_safe = len(warnings) == 0 or not self.strict_mode
-        return is_safe, warnings
+        patterns = [pattern.pattern for pattern in self.compiled_patterns if pattern.search(code)]
+        
+        return (
+            tuple(("function", func) for func in functions)
+            + tuple(("pattern", pattern) for pattern in patterns)
+            + tuple(("namespace", keyword) for keyword in namespaces)
+        )
+    
+    def _scan_hyperscan(self, code: str) -> Tuple[Tuple[str, str], ...]:
+        """Run all checks in one Hyperscan pass over the code."""
+        matched = set()
+        
+        def on_match(pattern_id, start, end, flags, context):
+            matched.add(pattern_id)
+        
+        with self._hs_lock:
+            self._hs_db.scan(code.encode("utf-8", "ignore"), match_event_handler=on_match, scratch=self._hs_scratch)
+        
+        return tuple(self._hs_labels[pattern_id] for pattern_id in sorted(matched))
 
 
 class RateLimiter:
-    """Rate limiter to prevent abuse."""
+    """Rate limiter to prevent abuse.
+    
+    Each IP gets a token bucket holding up to ``burst_size`` tokens that
+    refills at ``requests_per_minute``. Only ``(tokens, last_refill)`` is kept
+    per IP. Clients are spread over lock-striped shards so concurrent callers
+    only contend when their IPs land in the same shard, and each shard is an
+    LRU so idle IPs are dropped once it is full.
+    """
+    
+    SHARD_COUNT = 16  # Default; must be a power of two so the shard index is a bit mask
     
-    def __init__(self, requests_per_minute: int = 60, burst_size: int = 10):
+    def __init__(
+        self,
+        requests_per_minute: int = 60,
+        burst_size: int = 10,
+        max_clients: int = 100_000,
+        shard_count: int = SHARD_COUNT,
+    ):
         """Initialize rate limiter.
         
         Args:
             requests_per_minute: Maximum requests per minute per IP
             burst_size: Maximum burst requests allowed
+            max_clients: Number of tracked IPs before the least recently seen are evicted
+            shard_count: Number of lock-striped shards (a power of two)
         """
+        if shard_count < 1 or shard_count & (shard_count - 1):
+            raise ValueError(f"shard_count must be a power of two, got {shard_count}")
+        
         self.requests_per_minute = requests_per_minute
         self.burst_size = burst_size
-        self.requests: Dict[str, deque] = defaultdict(deque)
-        self.burst_counts: Dict[str, int] = defaultdict(int)
-        self.last_reset: Dict[str, float] = defaultdict(float)
+        self.max_clients = max_clients
+        self._refill_rate = requests_per_minute / 60.0  # Tokens per second
+        self._shard_mask = shard_count - 1
+        self._shard_capacity = max(1, max_clients // shard_count)
+        # Each shard pairs its LRU of (tokens, last_refill) with its own lock
+        self._shards: List[Tuple[OrderedDict[str, Tuple[float, float]], threading.Lock]] = [
+            (OrderedDict(), threading.Lock()) for _ in range(shard_count)
+        ]
     
     def is_allowed(self, client_ip: str) -> tuple[bool, str]:
         """Check if request is allowed for the given IP.
@@ -112,29 +238,29 @@ class RateLimiter:
         Returns:
             Tuple of (is_allowed, reason)
         """
-        current_time = time.time()
-        
-        # Clean old requests (older than 1 minute)
-        minute_ago = current_time - 60
-        while self.requests[client_ip] and self.requests[client_ip][0] < minute_ago:
-            self.requests[client_ip].popleft()
-        
-        # Reset burst counter every minute
-        if current_time - self.last_reset[client_ip] > 60:
-            self.burst_counts[client_ip] = 0
-            self.last_reset[client_ip] = current_time
-        
-        # Check burst limit
-        if self.burst_counts[client_ip] >= self.burst_size:
-            return False, f"Burst limit exceeded ({self.burst_size} requests)"
-        
-        # Check rate limit
-        if len(self.requests[client_ip]) >= self.requests_per_minute:
-            return False, f"Rate limit exceeded ({self.requests_per_minute} requests/minute)"
+        shard, lock = self._shards[hash(client_ip) & self._shard_mask]
+        now = time.monotonic()
         
-        # Allow the request
-        self.requests[client_ip].append(current_time)
-        self.burst_counts[client_ip] += 1
+        with lock:
+            state = shard.get(client_ip)
+            if state is None:
+                if len(shard) >= self._shard_capacity:
+                    shard.popitem(last=False)
+                tokens = float(self.burst_size)
+            else:
+                shard.move_to_end(client_ip)
+                tokens, last_refill = state
+                tokens = min(self.burst_size, tokens + (now - last_refill) * self._refill_rate)
+            
+            if tokens < 1.0:
+                shard[client_ip] = (tokens, now)
+                return False, (
+                    f"Rate limit exceeded ({self.requests_per_minute} requests/minute, "
+                    f"burst {self.burst_size})"
+                )
+            
+            # Allow the request
+            shard[client_ip] = (tokens - 1.0, now)
         
         return True, "OK"
 
@@ -149,6 +275,8 @@ class AuthenticationHandler:
             api_key: Optional API key for authentication
         """
         self.api_key = api_key
+        # Encoded once for the constant-time comparison in check_authorization
+        self._api_key_bytes = api_key.encode() if api_key else None
         self.bearer_scheme = HTTPBearer(auto_error=False)
     
     async def authenticate(self, request: Request) -> tuple[bool, str]:
@@ -157,6 +285,17 @@ class AuthenticationHandler:
         Args:
             request: FastAPI request object
             
+        Returns:
+            Tuple of (is_authenticated, reason)
+        """
+        return self.check_authorization(request.headers.get("Authorization"))
+    
+    def check_authorization(self, authorization: Optional[str]) -> tuple[bool, str]:
+        """Check a raw Authorization header value.
+        
+        Args:
+            authorization: Value of the Authorization header, if present
+            
         Returns:
             Tuple of (is_authenticated, reason)
         """
@@ -164,7 +303,6 @@ class AuthenticationHandler:
             # No authentication required
             return True, "No authentication required"
         
-        authorization = request.headers.get("Authorization")
         if not authorization:
             return False, "Missing Authorization header"
         
@@ -172,7 +310,7 @@ class AuthenticationHandler:
         if scheme.lower() != "bearer":
             return False, "Invalid authentication scheme"
         
-        if credentials != self.api_key:
+        if not hmac.compare_digest(credentials.encode(), self._api_key_bytes):
             return False, "Invalid API key"
         
         return True, "Authenticated"
@@ -1,9 +1,13 @@
 """Improved Wolfram Language client with better session management and performance."""
 
 import asyncio
+import functools
+import hashlib
 import logging
+import re
 import time
-from typing import Optional, Dict, Any, Tuple
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Set, Tuple
 from concurrent.futures import ThreadPoolExecutor
 
 from wolframclient.evaluation import WolframLanguageSession
@@ -13,129 +17,451 @@ from wolframclient.language import wl
 
 logger = logging.getLogger(__name__)
 
+# Code that changes kernel state: assignments and definitions in operator or
+# functional form, in-place mutators, scoping constructs, symbol removal,
+# package loading, contexts, options and protection. Running it invalidates
+# every cached result, since any of them may depend on the state it changed.
+_MUTATING_RE = re.compile(
+    r"(?<![=!<>])=(?![=!])|\+\+|--|<<"
+    r"|\b(?:Set|SetDelayed|UpSet|UpSetDelayed|TagSet|TagSetDelayed|Unset|SetAttributes"
+    r"|SetOptions|SetSystemOptions|Protect|Unprotect"
+    r"|Increment|Decrement|PreIncrement|PreDecrement|AddTo|SubtractFrom|TimesBy|DivideBy"
+    r"|AppendTo|PrependTo|AssociateTo|KeyDropFrom|Module|Unique|Clear\w*|Remove"
+    r"|Needs|Get|Begin|BeginPackage|End|EndPackage)\b"
+)
+
+# Code whose result may differ between evaluations even without a state
+# change: randomness, clocks and kernel properties (including the ones that
+# differ between pooled kernels).
+_VOLATILE_RE = re.compile(
+    r"\b(?:Random\w*|Now|Today|Date\w*|\w*Time(?:Used)?|\w*Timing)\b"
+    r"|\$(?:Line|MemoryAvailable|SessionID|ProcessID|KernelID|TimeZone|ModuleNumber)\b"
+    r"|MemoryInUse"
+)
+
+# Fixed expressions the client issues itself, built once and reused
+_PROBE_EXPR = wl.Plus(1, 1)
+_HEARTBEAT_EXPR = wlexpr("1")
+_VERSION_EXPR = wlexpr("$Version")
+_SYSTEM_ID_EXPR = wlexpr("$SystemID")
+
+# Longest code whose wlexpr wrapper is kept in the expression cache
+_EXPR_CACHE_MAX_CODE = 10_000
+
+
+@functools.lru_cache(maxsize=512)
+def _cached_wlexpr(code: str):
+    return wlexpr(code)
+
+
+def _compile_wlexpr(code: str):
+    """Build the expression for a code string, reusing it for repeated code."""
+    if len(code) > _EXPR_CACHE_MAX_CODE:
+        return wlexpr(code)
+    return _cached_wlexpr(code)
+
 
 class ImprovedWolframLanguageClient:
-    """Improved Wolfram Language client with optimized session management."""
+    """Improved Wolfram Language client with a pool of persistent kernel sessions."""
 
-    def __init__(self, kernel_path: Optional[str] = None):
+    def __init__(self, kernel_path: Optional[str] = None, pool_size: int = 1):
         """Initialize the Wolfram Language client.
 
         Args:
             kernel_path: Path to Wolfram kernel executable (optional)
+            pool_size: Number of kernel sessions kept ready in the pool
         """
         self.kernel_path = kernel_path
-        self._session: Optional[WolframLanguageSession] = None
+        self.pool_size = max(1, pool_size)
+        self._pool: asyncio.Queue[WolframLanguageSession] = asyncio.Queue()
+        self._sessions: Set[WolframLanguageSession] = set()
         self._session_lock = asyncio.Lock()
-        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wolfram")
-        self._session_initialized = False
+        self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="wolfram")
+        self._replenish_task: Optional[asyncio.Task] = None
+        self._background_tasks: Set[asyncio.Task] = set()
         self._last_activity = time.time()
+        self._healthy = False
+        self._last_ok = float("-inf")  # monotonic time of the last successful evaluation
+        self._kernel_version: Optional[str] = None  # $Version, fetched on first request
+        self._system_id: Optional[str] = None  # $SystemID, fetched on first request
 
         # Session keep-alive settings
-        self.session_timeout = 300  # 5 minutes of inactivity before closing
+        self.session_timeout = 300  # 5 minutes of inactivity before shrinking the pool
+        self.liveness_ttl = 30.0  # seconds a successful evaluation vouches for the pool
         self.max_retries = 3
+        self.replenish_interval = 30.0  # seconds between pool top-ups and heartbeats
+
+        # Availability probe cache
+        self.availability_ttl = 10.0  # seconds a probe result stays valid
+        self._avail_cached: Optional[Tuple[bool, Optional[str]]] = None
+        self._avail_expires = 0.0
 
-        logger.info(f"Wolfram client initialized with kernel_path: {kernel_path}")
+        # Result cache for deterministic code
+        self.result_cache_size = 1024
+        self._result_cache: OrderedDict[bytes, Any] = OrderedDict()
+        self._cache_generation = 0  # bumped whenever state-changing code runs
+        self._inflight: Dict[bytes, asyncio.Future] = {}
+
+        logger.info(f"Wolfram client initialized with kernel_path: {kernel_path}, pool_size: {self.pool_size}")
 
     async def _run_in_executor(self, func, *args):
         """Run a function in the thread executor."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(self._executor, func, *args)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
 
-    async def _ensure_session(self) -> bool:
-        """Ensure we have a working session, with retry logic."""
-        async with self._session_lock:
-            # Check if we need to create or recreate the session
-            if self._session is None or not self._session_initialized:
-                logger.info("Creating new Wolfram session...")
-
-                for attempt in range(self.max_retries):
-                    try:
-                        start_time = time.time()
-
-                        # Create session
-                        if self.kernel_path:
-                            self._session = WolframLanguageSession(kernel=self.kernel_path)
-                            logger.info(f"Using kernel path: {self.kernel_path}")
-                        else:
-                            self._session = WolframLanguageSession()
-                            logger.info("Using default kernel")
-
-                        # Test the session with a simple evaluation
-                        test_result = await self._run_in_executor(
-                            lambda: self._session.evaluate(wl.Plus(1, 1))
-                        )
-
-                        creation_time = time.time() - start_time
-                        logger.info(f"Session created successfully in {creation_time:.3f}s, test result: {test_result}")
-
-                        # Additional initialization to warm up the session
-                        await self._run_in_executor(
-                            lambda: self._session.evaluate(wlexpr("$Version"))
-                        )
-
-                        self._session_initialized = True
-                        self._last_activity = time.time()
-                        return True
-
-                    except Exception as e:
-                        logger.error(f"Session creation attempt {attempt + 1} failed: {e}")
-                        if self._session:
-                            try:
-                                await self._run_in_executor(self._session.terminate)
-                            except:
-                                pass
-                            self._session = None
-
-                        if attempt < self.max_retries - 1:
-                            await asyncio.sleep(2 ** attempt)  # Exponential backoff
-                        else:
-                            logger.error("All session creation attempts failed")
-                            return False
-            else:
-                # Session exists, check if it's still alive
+    def _spawn_background(self, coro) -> None:
+        """Run a coroutine in the background, keeping a reference until it finishes."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def _create_session(self) -> WolframLanguageSession:
+        """Start a kernel session and warm it up (runs in the executor).
+
+        Each session owns one long-lived kernel process reached over its ZMQ
+        sockets; it is reused for every evaluation until retired, so no
+        request ever launches a kernel or ``wolframscript`` of its own.
+        """
+        if self.kernel_path:
+            session = WolframLanguageSession(kernel=self.kernel_path)
+        else:
+            session = WolframLanguageSession()
+
+        try:
+            # Launch the kernel and connect its sockets now rather than on first evaluate
+            session.start()
+            # Test the session with a simple evaluation
+            session.evaluate(_PROBE_EXPR)
+        except Exception:
+            session.terminate()
+            raise
+
+        return session
+
+    async def _spawn_session(self) -> bool:
+        """Create a new session with retry logic and add it to the pool.
+
+        Kernel startup keeps running in the executor if the caller is
+        cancelled (e.g. by an execution timeout or close()); the kernel it
+        starts is then terminated rather than left holding a license slot.
+        """
+        for attempt in range(self.max_retries):
+            try:
+                start_time = time.time()
+                creation = asyncio.get_running_loop().run_in_executor(self._executor, self._create_session)
                 try:
-                    await self._run_in_executor(
-                        lambda: self._session.evaluate(wl.Plus(1, 1))
-                    )
-                    self._last_activity = time.time()
-                    return True
-                except Exception as e:
-                    logger.warning(f"Session health check failed: {e}, recreating session")
-                    self._session = None
-                    self._session_initialized = False
-                    return await self._ensure_session()  # Recursive call to recreate
+                    session = await asyncio.shield(creation)
+                except asyncio.CancelledError:
+                    creation.add_done_callback(self._discard_orphan)
+                    raise
+
+                creation_time = time.time() - start_time
+                logger.info(f"Session created successfully in {creation_time:.3f}s")
 
+                self._sessions.add(session)
+                self._pool.put_nowait(session)
+                self._last_ok = time.monotonic()
+                self._healthy = True
+                return True
+
+            except Exception as e:
+                logger.error(f"Session creation attempt {attempt + 1} failed: {e}")
+                if attempt < self.max_retries - 1:
+                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
+
+        logger.error("All session creation attempts failed")
         return False
 
-    async def execute_wolfram_code(self, code: str, timeout: int = 30) -> Tuple[bool, Any, Optional[str], float]:
+    def _discard_orphan(self, creation: asyncio.Future) -> None:
+        """Terminate a session that finished starting after its creator was cancelled."""
+        if creation.cancelled() or creation.exception() is not None:
+            return
+        self._spawn_background(self._terminate_orphan(creation.result()))
+
+    async def _terminate_orphan(self, session: WolframLanguageSession) -> None:
+        """Terminate an orphaned session without adding it to the pool."""
+        logger.info("Terminating session whose creation was cancelled")
+        try:
+            await asyncio.to_thread(session.terminate)
+        except Exception as e:
+            logger.warning(f"Error terminating orphaned session: {e}")
+
+    async def _fill_pool(self, target: int) -> int:
+        """Start sessions until at least ``target`` are live.
+
+        Returns:
+            Number of live sessions
+        """
+        async with self._session_lock:
+            missing = target - len(self._sessions)
+            if missing > 0:
+                if self.kernel_path:
+                    logger.info(f"Creating {missing} Wolfram session(s) using kernel path: {self.kernel_path}")
+                else:
+                    logger.info(f"Creating {missing} Wolfram session(s) using default kernel")
+                await asyncio.gather(*(self._spawn_session() for _ in range(missing)))
+                if not self._sessions:
+                    self._healthy = False
+            return len(self._sessions)
+
+    async def prewarm(self) -> int:
+        """Start the full session pool eagerly and keep it topped up.
+
+        All sessions boot concurrently. The replenish loop is started even if
+        none came up, so a kernel that becomes available later is picked up.
+
+        Returns:
+            Number of sessions ready (0 if the kernel could not be started)
+        """
+        live = await self._fill_pool(self.pool_size)
+        if self._replenish_task is None:
+            self._replenish_task = asyncio.create_task(self._replenish_loop())
+        return live
+
+    @property
+    def healthy(self) -> bool:
+        """Whether the pool currently holds a working kernel session.
+
+        Maintained from real evaluations, session creation and the background
+        heartbeat, so reading it never touches the kernel.
+        """
+        return self._healthy
+
+    async def _replenish_loop(self) -> None:
+        """Periodically replace retired sessions and heartbeat idle ones.
+
+        After ``session_timeout`` seconds without activity the pool is shrunk
+        to a single warm session; it grows back on the next request.
+        """
+        while True:
+            await asyncio.sleep(self.replenish_interval)
+            try:
+                if time.time() - self._last_activity > self.session_timeout:
+                    await self._reap_idle()
+                else:
+                    await self._fill_pool(self.pool_size)
+                await self._heartbeat()
+            except Exception as e:
+                logger.warning(f"Session pool maintenance failed: {e}")
+
+    async def _reap_idle(self) -> None:
+        """Terminate idle sessions beyond the one kept warm."""
+        async with self._session_lock:
+            reaped = []
+            while len(self._sessions) > 1 and not self._pool.empty():
+                session = self._pool.get_nowait()
+                self._sessions.discard(session)
+                reaped.append(session)
+
+        if reaped:
+            logger.info(f"Closing {len(reaped)} idle Wolfram session(s)")
+        for session in reaped:
+            try:
+                await self._run_in_executor(session.terminate)
+            except Exception as e:
+                logger.warning(f"Error terminating idle session: {e}")
+
+    async def _heartbeat(self) -> None:
+        """Probe the sessions that are currently idle, retiring dead ones."""
+        idle = []
+        while not self._pool.empty():
+            idle.append(self._pool.get_nowait())
+
+        async def probe(session: WolframLanguageSession) -> None:
+            try:
+                await self._run_in_executor(session.evaluate, _HEARTBEAT_EXPR)
+            except Exception as e:
+                logger.warning(f"Session heartbeat failed: {e}, recreating session")
+                self._retire(session)
+            else:
+                # Heartbeats are not client activity, so _last_activity is left alone
+                self._last_ok = time.monotonic()
+                if session in self._sessions:
+                    self._pool.put_nowait(session)
+
+        await asyncio.gather(*(probe(session) for session in idle))
+
+    async def _acquire(self) -> Optional[WolframLanguageSession]:
+        """Claim an idle, running session, starting one if the pool is empty.
+
+        Sessions whose kernel process has exited are retired on checkout;
+        ``started`` only inspects the local controller, so this costs no
+        kernel round-trip.
+        """
+        if self._sessions and len(self._sessions) < self.pool_size and not self._session_lock.locked():
+            # Grow back to full size after an idle shrink, without waiting on it
+            self._spawn_background(self._fill_pool(self.pool_size))
+
+        while True:
+            if not self._sessions and not await self._fill_pool(1):
+                return None
+            session = await self._pool.get()
+            if session.started:
+                return session
+            logger.warning("Pooled session kernel is no longer running, recreating session")
+            self._retire(session)
+
+    def _release(self, session: WolframLanguageSession) -> None:
+        """Return a healthy session to the pool."""
+        if session in self._sessions:
+            self._pool.put_nowait(session)
+
+    def _retire(self, session: WolframLanguageSession) -> None:
+        """Drop a broken or still-busy session and schedule a replacement."""
+        self._sessions.discard(session)
+        self._spawn_background(self._terminate_and_replace(session))
+
+    async def _terminate_and_replace(self, session: WolframLanguageSession) -> None:
+        """Terminate a retired session and top the pool back up."""
+        try:
+            # The executor thread may still be blocked on this session
+            await asyncio.to_thread(session.terminate)
+        except Exception as e:
+            logger.warning(f"Error terminating retired session: {e}")
+        await self._fill_pool(self.pool_size)
+
+    async def _evaluate(self, expr) -> Any:
+        """Evaluate an expression on a pooled session.
+
+        The session is retired instead of returned to the pool if the
+        evaluation fails or is cancelled (e.g. by a timeout), since the
+        kernel may still be busy.
+        """
+        session = await self._acquire()
+        if session is None:
+            raise RuntimeError("Failed to establish Wolfram session")
+
+        try:
+            result = await self._run_in_executor(session.evaluate, expr)
+        except BaseException:
+            self._retire(session)
+            raise
+
+        self._release(session)
+        self._last_ok = time.monotonic()
+        self._healthy = True
+        return result
+
+    async def _ensure_session(self) -> bool:
+        """Ensure the pool has a working session, with retry logic.
+
+        The kernel is only probed when no evaluation has succeeded within
+        ``liveness_ttl``; failures during real evaluations still retire and
+        replace sessions.
+        """
+        if not self._sessions:
+            # Freshly created sessions are tested during creation
+            return await self._fill_pool(1) > 0
+
+        if time.monotonic() - self._last_ok < self.liveness_ttl:
+            return True
+
+        # Session exists, check if it's still alive
+        session = await self._pool.get()
+        try:
+            await self._run_in_executor(session.evaluate, _PROBE_EXPR)
+        except Exception as e:
+            logger.warning(f"Session health check failed: {e}, recreating session")
+            self._retire(session)
+            return await self._ensure_session()  # Recursive call to recreate
+
+        self._release(session)
+        self._last_ok = time.monotonic()
+        return True
+
+    @staticmethod
+    def _cache_key(code: str) -> bytes:
+        """Build the result cache key for a snippet."""
+        return hashlib.blake2b(code.strip().encode(), digest_size=16).digest()
+
+    def _cache_get(self, key: bytes) -> Tuple[bool, Any]:
+        """Look up a cached result, marking it as recently used."""
+        try:
+            result = self._result_cache[key]
+        except KeyError:
+            return False, None
+        self._result_cache.move_to_end(key)
+        return True, result
+
+    def _cache_put(self, key: bytes, result: Any) -> None:
+        """Store a result, evicting the least recently used entry when full."""
+        self._result_cache[key] = result
+        self._result_cache.move_to_end(key)
+        if len(self._result_cache) > self.result_cache_size:
+            self._result_cache.popitem(last=False)
+
+    async def execute_wolfram_code(
+        self, code: str, timeout: int = 30, cacheable: bool = True
+    ) -> Tuple[bool, Any, Optional[str], float]:
         """Execute Wolfram Language code using wlexpr (strict syntax).
 
         Args:
             code: Wolfram Language code to execute (strict syntax)
             timeout: Execution timeout in seconds
+            cacheable: Allow serving and storing the result in the result cache
 
         Returns:
             Tuple of (success, result, error_message, execution_time)
         """
+        if _MUTATING_RE.search(code):
+            # Results cached before this code ran may no longer hold
+            self._result_cache.clear()
+            self._cache_generation += 1
+            return await self._execute(code, timeout)
+
+        if not cacheable or _VOLATILE_RE.search(code):
+            return await self._execute(code, timeout)
+
+        cache_key = self._cache_key(code)
+        hit, result = self._cache_get(cache_key)
+        if hit:
+            logger.info(f"Serving cached result for: {code[:100]}...")
+            return True, result, None, 0.0
+
+        # Identical code already running: wait for that evaluation instead
+        pending = self._inflight.get(cache_key)
+        if pending is not None:
+            logger.info(f"Joining in-flight evaluation for: {code[:100]}...")
+            start_time = time.time()
+            try:
+                async with asyncio.timeout(timeout):
+                    return await asyncio.shield(pending)
+            except asyncio.TimeoutError:
+                logger.error(f"Execution timed out after {timeout}s")
+                return False, None, f"Execution timed out after {timeout} seconds", time.time() - start_time
+            except asyncio.CancelledError:
+                if not pending.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                # The leading caller was cancelled, not this one: evaluate it ourselves
+                return await self.execute_wolfram_code(code, timeout, cacheable)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        generation = self._cache_generation
+        try:
+            outcome = await self._execute(code, timeout)
+            # Skip storing if state-changing code ran while this was evaluating
+            if outcome[0] and generation == self._cache_generation:
+                self._cache_put(cache_key, outcome[1])
+            future.set_result(outcome)
+            return outcome
+        finally:
+            del self._inflight[cache_key]
+            if not future.done():
+                future.cancel()
+
+    async def _execute(self, code: str, timeout: int) -> Tuple[bool, Any, Optional[str], float]:
+        """Run code on the kernel, bypassing the result cache."""
         logger.info(f"Executing Wolfram code: {code[:100]}...")
+        # Only client code counts as activity; health checks and heartbeats
+        # must not keep an idle pool from shrinking
+        self._last_activity = time.time()
         start_time = time.time()
 
         try:
-            # Ensure we have a working session
-            if not await self._ensure_session():
-                return False, None, "Failed to establish Wolfram session", 0.0
-
-            # Parse and execute the code
-            def execute():
-                parsed_code = wlexpr(code)
-                return self._session.evaluate(parsed_code)
-
-            # Execute with timeout
+            # Execute with timeout; failed sessions are retired by _evaluate
             try:
-                result = await asyncio.wait_for(
-                    self._run_in_executor(execute),
-                    timeout=timeout
-                )
+                async with asyncio.timeout(timeout):
+                    result = await self._evaluate(_compile_wlexpr(code))
 
                 execution_time = time.time() - start_time
                 logger.info(f"Execution completed in {execution_time:.3f}s")
@@ -152,45 +478,109 @@ class ImprovedWolframLanguageClient:
             logger.error(f"Execution failed: {e}")
             return False, None, str(e), execution_time
 
+    async def execute_batch(
+        self, codes: List[str], timeout: int = 30, cacheable: bool = True
+    ) -> List[Tuple[bool, Any, Optional[str], float]]:
+        """Execute independent snippets concurrently across the session pool.
 
-    async def is_available(self) -> Tuple[bool, Optional[str]]:
+        At most ``pool_size`` snippets of a batch run at once; the rest wait
+        their turn before their timeout starts, so a large batch is not
+        failed by time spent queueing for a kernel.
+
+        Args:
+            codes: Wolfram Language snippets to execute (strict syntax)
+            timeout: Execution timeout in seconds, applied to each snippet separately
+            cacheable: Allow serving and storing results in the result cache
+
+        Returns:
+            List of (success, result, error_message, execution_time) tuples in input order
+        """
+        slots = asyncio.Semaphore(self.pool_size)
+
+        async def run(code: str) -> Tuple[bool, Any, Optional[str], float]:
+            async with slots:
+                return await self.execute_wolfram_code(code, timeout, cacheable)
+
+        return await asyncio.gather(*(run(code) for code in codes))
+
+    async def is_available(self, force: bool = False) -> Tuple[bool, Optional[str]]:
         """Check if Wolfram Engine is available.
 
+        The probe result is cached for ``availability_ttl`` seconds so the
+        request path does not pay a kernel round-trip on every call.
+
+        Args:
+            force: Bypass the cache and probe the kernel
+
         Returns:
             Tuple of (available, error_message)
         """
+        if not force and self._avail_cached is not None and time.monotonic() < self._avail_expires:
+            return self._avail_cached
+
         try:
             if await self._ensure_session():
-                return True, None
+                result = (True, None)
             else:
-                return False, "Failed to create Wolfram session"
+                result = (False, "Failed to create Wolfram session")
         except Exception as e:
-            return False, str(e)
+            result = (False, str(e))
+
+        self._avail_cached = result
+        self._avail_expires = time.monotonic() + self.availability_ttl
+        return result
+
+    async def start_session(self) -> bool:
+        """Start a Wolfram session if needed (alias for _ensure_session)."""
+        return await self._ensure_session()
+
+    async def execute_code(
+        self, code: str, timeout: int = 30, cacheable: bool = True
+    ) -> Tuple[bool, Any, Optional[str], float]:
+        """Execute Wolfram Language code (alias for execute_wolfram_code)."""
+        return await self.execute_wolfram_code(code, timeout, cacheable)
 
     async def stop_session(self) -> None:
         """Stop the Wolfram session (alias for close)."""
         await self.close()
 
+    async def _get_kernel_version(self) -> str:
+        """Return the kernel's $Version, evaluating it only the first time."""
+        if self._kernel_version is None:
+            version = await self._evaluate(_VERSION_EXPR)
+            self._kernel_version = str(version) if version else "Unknown"
+        return self._kernel_version
+
+    async def _get_system_id(self) -> str:
+        """Return the kernel's $SystemID, evaluating it only the first time."""
+        if self._system_id is None:
+            system_id = await self._evaluate(_SYSTEM_ID_EXPR)
+            self._system_id = str(system_id) if system_id else "Unknown"
+        return self._system_id
+
     async def get_kernel_info(self) -> Optional[Dict[str, Any]]:
         """Get information about the Wolfram Kernel.
 
+        The kernel is only queried until $Version and $SystemID are cached;
+        after that the pool's health flag decides availability, so periodic
+        health checks never evaluate anything.
+
         Returns:
             Dictionary with kernel information or None if unavailable
         """
         try:
-            if not await self._ensure_session():
+            if self._kernel_version is None or self._system_id is None:
+                if not await self._ensure_session():
+                    return None
+            elif not self._healthy:
                 return None
 
-            version = await self._run_in_executor(
-                lambda: self._session.evaluate(wlexpr("$Version"))
-            )
-            system_id = await self._run_in_executor(
-                lambda: self._session.evaluate(wlexpr("$SystemID"))
-            )
+            version = await self._get_kernel_version()
+            system_id = await self._get_system_id()
 
             return {
-                "version": str(version) if version else "Unknown",
-                "system_id": str(system_id) if system_id else "Unknown",
+                "version": version,
+                "system_id": system_id,
                 "session_active": True
             }
         except Exception as e:
@@ -198,37 +588,48 @@ class ImprovedWolframLanguageClient:
             return None
 
     async def get_session_info(self) -> Dict[str, Any]:
-        """Get information about the current session."""
+        """Get information about the current session pool."""
+        session_active = bool(self._sessions)
         info = {
-            "session_active": self._session is not None and self._session_initialized,
+            "session_active": session_active,
+            "pool_size": self.pool_size,
+            "sessions_live": len(self._sessions),
+            "sessions_idle": self._pool.qsize(),
             "last_activity": self._last_activity,
             "kernel_path": self.kernel_path,
-            "session_age": time.time() - self._last_activity if self._session_initialized else None
+            "session_age": time.time() - self._last_activity if session_active else None
         }
 
-        if self._session and self._session_initialized:
+        if session_active:
             try:
-                version = await self._run_in_executor(
-                    lambda: self._session.evaluate(wlexpr("$Version"))
-                )
-                info["version"] = str(version)
+                info["version"] = await self._get_kernel_version()
             except Exception as e:
                 info["version_error"] = str(e)
 
         return info
 
     async def close(self) -> None:
-        """Close the Wolfram session and cleanup resources."""
+        """Close all Wolfram sessions and cleanup resources."""
+        if self._replenish_task is not None:
+            self._replenish_task.cancel()
+            self._replenish_task = None
+        for task in list(self._background_tasks):
+            task.cancel()
+
         async with self._session_lock:
-            if self._session:
+            sessions = list(self._sessions)
+            self._sessions.clear()
+            while not self._pool.empty():
+                self._pool.get_nowait()
+
+            for session in sessions:
                 try:
-                    await self._run_in_executor(self._session.terminate)
+                    await self._run_in_executor(session.terminate)
                     logger.info("Wolfram session terminated")
                 except Exception as e:
                     logger.warning(f"Error terminating session: {e}")
-                finally:
-                    self._session = None
-                    self._session_initialized = False
+
+        self._result_cache.clear()
 
         # Shutdown the executor
         self._executor.shutdown(wait=True)
@@ -241,3 +642,7 @@ class ImprovedWolframLanguageClient:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
         await self.close()
+
+
+# Older name for the client, still used by the standalone test scripts
+WolframExecutor = ImprovedWolframLanguageClient
@@ -34,4 +34,9 @@ async def test_kernel_path():
     await executor.stop_session()
 
 if __name__ == "__main__":
-    asyncio.run(test_kernel_path())
\ No newline at end of file
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(test_kernel_path())
+    else:
+        uvloop.run(test_kernel_path())
\ No newline at end of file
@@ -0,0 +1,138 @@
+"""Unit tests for the result cache classifiers; no Wolfram kernel needed."""
+
+import unittest
+
+from wolfram_language_server.wolfram_client import (
+    ImprovedWolframLanguageClient,
+    _MUTATING_RE,
+    _VOLATILE_RE,
+)
+
+
+class MutatingCodeTest(unittest.TestCase):
+    """Code that changes kernel state must be recognised."""
+
+    MUTATING = [
+        "x = 5",
+        "f[x_] := x^2",
+        "x += 1",
+        "f[x_] ^= 1",
+        "x++",
+        "--x",
+        "Set[f, 27]",
+        "SetDelayed[f[x_], x]",
+        "Increment[x]",
+        "AddTo[x, 1]",
+        "AppendTo[list, 1]",
+        "AssociateTo[assoc, a -> 1]",
+        "Module[{a}, a]",
+        "Clear[x]",
+        "ClearAll[\"Global`*\"]",
+        "Remove[x]",
+        "Needs[\"ComputationalGeometry`\"]",
+        "Get[\"pkg.m\"]",
+        "<< pkg`",
+        "SetOptions[Plot, PlotRange -> All]",
+        "SetSystemOptions[\"CacheOptions\" -> False]",
+        "Begin[\"ctx`\"]",
+        "BeginPackage[\"pkg`\"]",
+        "End[]",
+        "EndPackage[]",
+        "Protect[x]",
+        "Unprotect[Plus]",
+        "SetAttributes[f, Listable]",
+    ]
+
+    PURE = [
+        "2 + 2",
+        "Solve[x^2 + 2x - 3 == 0, x]",
+        "Integrate[x^2, x]",
+        "Prime[100]",
+        "x != y",
+        "a <= b",
+        "{1, 2} /. a -> b",
+        "f[3]",
+        "GetEnvironment[]",
+        "SetPrecision[Pi, 20]",
+    ]
+
+    def test_mutating_code_matches(self):
+        for code in self.MUTATING:
+            with self.subTest(code=code):
+                self.assertIsNotNone(_MUTATING_RE.search(code))
+
+    def test_pure_code_does_not_match(self):
+        for code in self.PURE:
+            with self.subTest(code=code):
+                self.assertIsNone(_MUTATING_RE.search(code))
+
+
+class VolatileCodeTest(unittest.TestCase):
+    """Code whose result changes between evaluations must be recognised."""
+
+    VOLATILE = [
+        "RandomInteger[10]",
+        "RandomReal[]",
+        "Now",
+        "DateString[]",
+        "AbsoluteTime[]",
+        "AbsoluteTiming[Prime[10^6]]",
+        "$KernelID",
+        "$SessionID",
+        "$Line",
+        "MemoryInUse[]",
+    ]
+
+    PURE = [
+        "2 + 2",
+        "Prime[100]",
+        "$Version",
+        "$SystemID",
+        "Integrate[x^2, x]",
+    ]
+
+    def test_volatile_code_matches(self):
+        for code in self.VOLATILE:
+            with self.subTest(code=code):
+                self.assertIsNotNone(_VOLATILE_RE.search(code))
+
+    def test_pure_code_does_not_match(self):
+        for code in self.PURE:
+            with self.subTest(code=code):
+                self.assertIsNone(_VOLATILE_RE.search(code))
+
+
+class CacheInvalidationTest(unittest.IsolatedAsyncioTestCase):
+    """State-changing code clears results cached before it ran."""
+
+    async def asyncSetUp(self):
+        self.client = ImprovedWolframLanguageClient()
+        self.state = {}
+
+        async def fake_execute(code, timeout):
+            # Stands in for the kernel: "f = n" assigns, anything else reads f
+            if code.startswith("f = "):
+                self.state["f"] = int(code[4:])
+                return True, None, None, 0.0
+            return True, self.state.get("f"), None, 0.0
+
+        self.client._execute = fake_execute
+
+    async def asyncTearDown(self):
+        await self.client.close()
+
+    async def test_redefinition_invalidates_cached_read(self):
+        await self.client.execute_wolfram_code("f = 9")
+        self.assertEqual((await self.client.execute_wolfram_code("f[3]"))[1], 9)
+        await self.client.execute_wolfram_code("f = 27")
+        self.assertEqual((await self.client.execute_wolfram_code("f[3]"))[1], 27)
+
+    async def test_pure_read_is_cached(self):
+        await self.client.execute_wolfram_code("f = 9")
+        await self.client.execute_wolfram_code("f[3]")
+        self.state["f"] = 1  # Changed behind the cache's back
+        self.assertEqual((await self.client.execute_wolfram_code("f[3]"))[1], 9)
+
+
+if __name__ == "__main__":
+    unittest.main()